@@ -1,5 +1,5 @@
 from .modem import Sim800lModem
 from .logger import ModemLoggerInterface, Sim800lModemDefaultLogger
-from .errors import GenericATError
+from .errors import GenericATError, ATBatchError
 from .uart import ModemUART
-from .response import ModemResponse
+from .response import ModemResponse, ModemBatchResult
@@ -2,3 +2,10 @@
 class GenericATError(Exception):
     pass
 
+
+class ATBatchError(GenericATError):
+    def __init__(self, command: str, index: int, results: list):
+        super().__init__('Got generic AT error for command "{}" (#{} in batch)'.format(command, index))
+        self.command = command
+        self.index = index
+        self.results = results
@@ -115,19 +115,15 @@ class Sim800lModem:
         except GenericATError:
             pass
 
-        # First, init gprs
-        self.logger.debug('Connect step #1 (initgprs)')
-        self.uart.execute_at_command('initgprs')
-
-        # Second, set the APN
-        self.logger.debug('Connect step #2 (setapn)')
-        self.uart.execute_at_command('setapn', apn)
-        self.uart.execute_at_command('setuser', user)
-        self.uart.execute_at_command('setpwd', pwd)
-
-        # Then, open the GPRS connection.
-        self.logger.debug('Connect step #3 (opengprs)')
-        self.uart.execute_at_command('opengprs')
+        # Init gprs, set the APN and open the GPRS connection, batched in a single round trip
+        self.logger.debug('Connect steps #1-#3 (initgprs, setapn, setuser, setpwd, opengprs)')
+        self.uart.execute_batch([
+            'initgprs',
+            ('setapn', apn),
+            ('setuser', user),
+            ('setpwd', pwd),
+            'opengprs',
+        ])
 
         # Ok, now wait until we get a valid IP address
         retries = 0
@@ -175,47 +171,47 @@ class Sim800lModem:
         except GenericATError:
             pass
 
-        # First, init and set http
+        # First, init http
         self.logger.debug('Http request step #1.1 (inithttp)')
         self.uart.execute_at_command('inithttp')
-        self.logger.debug('Http request step #1.2 (sethttp)')
-        self.uart.execute_at_command('sethttp')
+
+        # Then set http, ssl, url (and content type) in a single batch
+        http_setup = ['sethttp']
 
         # Do we have to enable ssl as well?
         if self.is_ssl_available:
             if url.startswith('https://'):
-                self.logger.debug('Http request step #1.3 (enablessl)')
-                self.uart.execute_at_command('enablessl')
+                http_setup.append('enablessl')
             elif url.startswith('http://'):
-                self.logger.debug('Http request step #1.3 (disablessl)')
-                self.uart.execute_at_command('disablessl')
+                http_setup.append('disablessl')
         else:
             if url.startswith('https://'):
                 raise NotImplementedError("SSL is only supported by firmware revisions >= R14.00")
 
-        # Second, init and execute the request
-        self.logger.debug('Http request step #2.1 (initurl)')
-        self.uart.execute_at_command('initurl', data=url)
+        http_setup.append(('initurl', url))
+        if mode == 'POST':
+            http_setup.append(('setcontent', content_type))
+
+        self.logger.debug('Http request step #1.2 (batched setup: {})'.format(
+            ', '.join([item if isinstance(item, str) else item[0] for item in http_setup])))
+        self.uart.execute_batch(http_setup)
 
         if mode == 'GET':
 
-            self.logger.debug('Http request step #2.2 (doget)')
+            self.logger.debug('Http request step #2.1 (doget)')
             output = self.uart.execute_at_command('doget')
             response_status_code = output.split(',')[1]
             self.logger.debug('Response status code: "{}"'.format(response_status_code))
 
         elif mode == 'POST':
 
-            self.logger.debug('Http request step #2.2 (setcontent)')
-            self.uart.execute_at_command('setcontent', content_type)
-
-            self.logger.debug('Http request step #2.3 (postlen)')
+            self.logger.debug('Http request step #2.1 (postlen)')
             self.uart.execute_at_command('postlen', len(data))
 
-            self.logger.debug('Http request step #2.4 (dumpdata)')
+            self.logger.debug('Http request step #2.2 (dumpdata)')
             self.uart.execute_at_command('dumpdata', data)
 
-            self.logger.debug('Http request step #2.5 (dopost)')
+            self.logger.debug('Http request step #2.3 (dopost)')
             output = self.uart.execute_at_command('dopost')
             response_status_code = output.split(',')[1]
             self.logger.debug('Response status code: "{}"'.format(response_status_code))
@@ -224,7 +220,7 @@ class Sim800lModem:
             raise Exception('Unknown mode "{}'.format(mode))
 
         # Third, get data
-        self.logger.debug('Http request step #4 (getdata)')
+        self.logger.debug('Http request step #3 (getdata)')
         response_content = self.uart.execute_at_command('getdata', clean_output=False)
 
         self.logger.debug(response_content)
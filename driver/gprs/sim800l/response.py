@@ -6,3 +6,7 @@ class ModemResponse(object):
         self.content = content
 
 
+class ModemBatchResult(object):
+    def __init__(self, command, output):
+        self.command = command
+        self.output = output
@@ -1,6 +1,7 @@
 # Imports
 from .logger import ModemLoggerInterface, Sim800lModemDefaultLogger
-from .errors import GenericATError
+from .errors import GenericATError, ATBatchError
+from .response import ModemBatchResult
 import time
 import json
 from machine import UART
@@ -13,6 +14,9 @@ class ModemUART(UART):
     # logger
     __logger: ModemLoggerInterface | None = None
 
+    # SIM800 command line buffer size, batched lines are split to fit in it
+    MAX_BATCH_LINE_LENGTH: int = 556
+
     def __init__(self, rx_pin: int, tx_pin: int):
         self.__rx_pin = rx_pin
         self.__tx_pin = tx_pin
@@ -31,39 +35,44 @@ class ModemUART(UART):
     # ----------------------
     # Execute AT commands
     # ----------------------
-    def execute_at_command(self, command: str, data=None, clean_output=True):
+    def __get_command(self, command: str, data=None) -> dict:
 
         # Commands dictionary. Not the best approach ever, but works nicely.
+        # "batch" tells if the command can be joined with others by execute_batch():
+        #   'any'   -> idempotent, can take any position in a batched line
+        #   'query' -> as 'any', and answers with a "+<NAME>: ..." line
+        #   'last'  -> not idempotent, can only close a batched line
+        #   None    -> always executed on its own
         commands = {
-            'modeminfo': {'string': 'ATI', 'timeout': 3, 'end': 'OK'},
-            'fwrevision': {'string': 'AT+CGMR', 'timeout': 3, 'end': 'OK'},
-            'battery': {'string': 'AT+CBC', 'timeout': 3, 'end': 'OK'},
-            'scan': {'string': 'AT+COPS=?', 'timeout': 60, 'end': 'OK'},
-            'network': {'string': 'AT+COPS?', 'timeout': 3, 'end': 'OK'},
-            'signal': {'string': 'AT+CSQ', 'timeout': 3, 'end': 'OK'},
-            'checkreg': {'string': 'AT+CREG?', 'timeout': 3, 'end': None},
-            'setapn': {'string': 'AT+SAPBR=3,1,"APN","{}"'.format(data), 'timeout': 3, 'end': 'OK'},
-            'setuser': {'string': 'AT+SAPBR=3,1,"USER","{}"'.format(data), 'timeout': 3, 'end': 'OK'},
-            'setpwd': {'string': 'AT+SAPBR=3,1,"PWD","{}"'.format(data), 'timeout': 3, 'end': 'OK'},
-            'initgprs': {'string': 'AT+SAPBR=3,1,"Contype","GPRS"', 'timeout': 3, 'end': 'OK'},
+            'modeminfo': {'string': 'ATI', 'timeout': 3, 'end': 'OK', 'batch': None},
+            'fwrevision': {'string': 'AT+CGMR', 'timeout': 3, 'end': 'OK', 'batch': None},
+            'battery': {'string': 'AT+CBC', 'timeout': 3, 'end': 'OK', 'batch': 'query'},
+            'scan': {'string': 'AT+COPS=?', 'timeout': 60, 'end': 'OK', 'batch': None},
+            'network': {'string': 'AT+COPS?', 'timeout': 3, 'end': 'OK', 'batch': 'query'},
+            'signal': {'string': 'AT+CSQ', 'timeout': 3, 'end': 'OK', 'batch': 'query'},
+            'checkreg': {'string': 'AT+CREG?', 'timeout': 3, 'end': None, 'batch': None},
+            'setapn': {'string': 'AT+SAPBR=3,1,"APN","{}"'.format(data), 'timeout': 3, 'end': 'OK', 'batch': 'any'},
+            'setuser': {'string': 'AT+SAPBR=3,1,"USER","{}"'.format(data), 'timeout': 3, 'end': 'OK', 'batch': 'any'},
+            'setpwd': {'string': 'AT+SAPBR=3,1,"PWD","{}"'.format(data), 'timeout': 3, 'end': 'OK', 'batch': 'any'},
+            'initgprs': {'string': 'AT+SAPBR=3,1,"Contype","GPRS"', 'timeout': 3, 'end': 'OK', 'batch': 'any'},
             # Appeared on hologram net here or below
-            'opengprs': {'string': 'AT+SAPBR=1,1', 'timeout': 3, 'end': 'OK'},
-            'getbear': {'string': 'AT+SAPBR=2,1', 'timeout': 3, 'end': 'OK'},
-            'inithttp': {'string': 'AT+HTTPINIT', 'timeout': 3, 'end': 'OK'},
-            'sethttp': {'string': 'AT+HTTPPARA="CID",1', 'timeout': 3, 'end': 'OK'},
-            'checkssl': {'string': 'AT+CIPSSL=?', 'timeout': 3, 'end': 'OK'},
-            'enablessl': {'string': 'AT+HTTPSSL=1', 'timeout': 3, 'end': 'OK'},
-            'disablessl': {'string': 'AT+HTTPSSL=0', 'timeout': 3, 'end': 'OK'},
-            'initurl': {'string': 'AT+HTTPPARA="URL","{}"'.format(data), 'timeout': 3, 'end': 'OK'},
-            'doget': {'string': 'AT+HTTPACTION=0', 'timeout': 3, 'end': '+HTTPACTION'},
-            'setcontent': {'string': 'AT+HTTPPARA="CONTENT","{}"'.format(data), 'timeout': 3, 'end': 'OK'},
-            'postlen': {'string': 'AT+HTTPDATA={},5000'.format(data), 'timeout': 3, 'end': 'DOWNLOAD'},
+            'opengprs': {'string': 'AT+SAPBR=1,1', 'timeout': 3, 'end': 'OK', 'batch': 'last'},
+            'getbear': {'string': 'AT+SAPBR=2,1', 'timeout': 3, 'end': 'OK', 'batch': 'query'},
+            'inithttp': {'string': 'AT+HTTPINIT', 'timeout': 3, 'end': 'OK', 'batch': 'last'},
+            'sethttp': {'string': 'AT+HTTPPARA="CID",1', 'timeout': 3, 'end': 'OK', 'batch': 'any'},
+            'checkssl': {'string': 'AT+CIPSSL=?', 'timeout': 3, 'end': 'OK', 'batch': 'query'},
+            'enablessl': {'string': 'AT+HTTPSSL=1', 'timeout': 3, 'end': 'OK', 'batch': 'any'},
+            'disablessl': {'string': 'AT+HTTPSSL=0', 'timeout': 3, 'end': 'OK', 'batch': 'any'},
+            'initurl': {'string': 'AT+HTTPPARA="URL","{}"'.format(data), 'timeout': 3, 'end': 'OK', 'batch': 'any'},
+            'doget': {'string': 'AT+HTTPACTION=0', 'timeout': 3, 'end': '+HTTPACTION', 'batch': None},
+            'setcontent': {'string': 'AT+HTTPPARA="CONTENT","{}"'.format(data), 'timeout': 3, 'end': 'OK', 'batch': 'any'},
+            'postlen': {'string': 'AT+HTTPDATA={},5000'.format(data), 'timeout': 3, 'end': 'DOWNLOAD', 'batch': None},
             # "data" is data_lenght in this context, while 5000 is the timeout
-            'dumpdata': {'string': data, 'timeout': 1, 'end': 'OK'},
-            'dopost': {'string': 'AT+HTTPACTION=1', 'timeout': 3, 'end': '+HTTPACTION'},
-            'getdata': {'string': 'AT+HTTPREAD', 'timeout': 3, 'end': 'OK'},
-            'closehttp': {'string': 'AT+HTTPTERM', 'timeout': 3, 'end': 'OK'},
-            'closebear': {'string': 'AT+SAPBR=0,1', 'timeout': 3, 'end': 'OK'}
+            'dumpdata': {'string': data, 'timeout': 1, 'end': 'OK', 'batch': None},
+            'dopost': {'string': 'AT+HTTPACTION=1', 'timeout': 3, 'end': '+HTTPACTION', 'batch': None},
+            'getdata': {'string': 'AT+HTTPREAD', 'timeout': 3, 'end': 'OK', 'batch': None},
+            'closehttp': {'string': 'AT+HTTPTERM', 'timeout': 3, 'end': 'OK', 'batch': None},
+            'closebear': {'string': 'AT+SAPBR=0,1', 'timeout': 3, 'end': 'OK', 'batch': None}
         }
 
         # References:
@@ -76,10 +85,12 @@ class ModemUART(UART):
         if command not in commands:
             raise Exception('Unknown command "{}"'.format(command))
 
+        return commands[command]
+
+    def __write_and_read(self, command: str, command_string: str, excpected_end: str | None, timeout: int,
+                         clean_output: bool = True) -> str:
+
         # Support vars
-        command_string: str = commands[command]['string']
-        excpected_end: str | None = commands[command]['end']
-        timeout: int = commands[command]['timeout']
         processed_lines = 0
 
         # Execute the AT command
@@ -162,6 +173,133 @@ class ModemUART(UART):
         # Return
         return output
 
+    def execute_at_command(self, command: str, data=None, clean_output=True):
+        command_def = self.__get_command(command, data)
+        return self.__write_and_read(command, command_def['string'], command_def['end'], command_def['timeout'],
+                                     clean_output=clean_output)
+
+    # ----------------------
+    # Execute batched AT commands
+    # ----------------------
+    def execute_batch(self, commands: list) -> list:
+        """
+        Execute several AT commands using as few round trips as possible.
+
+        Each item of ``commands`` is either a command name or a ``(command, data)`` tuple.
+        Consecutive batchable commands are joined in a single ``;`` separated line, as long as
+        it fits in MAX_BATCH_LINE_LENGTH, the others are executed on their own.
+
+        Returns a list of ModemBatchResult, one per command and in the same order.
+        On the first failing command raises ATBatchError, carrying the failing command and
+        the results of the commands executed before it. Commands after it are not executed.
+        Timeouts are not attributed: the plain timeout Exception is raised as is, without the
+        results of the commands executed before it.
+        """
+
+        # Normalize the commands to (command, data) tuples
+        items = []
+        for item in commands:
+            if isinstance(item, str):
+                item = (item, None)
+            command, data = item
+            items.append((command, data, self.__get_command(command, data)))
+
+        # Group the commands in lines
+        chunks = []
+        chunk = []
+        chunk_length = 0
+        for item in items:
+            command_def = item[2]
+            batch = command_def['batch']
+            if batch is None or not command_def['string'].startswith('AT+'):
+                if chunk:
+                    chunks.append(chunk)
+                chunks.append([item])
+                chunk = []
+                chunk_length = 0
+                continue
+
+            # "AT" prefix is shared, every other command adds its own body plus the ";" separator
+            item_length = len(command_def['string']) - 2
+            if chunk and chunk_length + 1 + item_length > self.MAX_BATCH_LINE_LENGTH:
+                chunks.append(chunk)
+                chunk = []
+                chunk_length = 0
+            if not chunk:
+                chunk_length = 2 + item_length
+            else:
+                chunk_length += 1 + item_length
+            chunk.append(item)
+
+            if batch == 'last':
+                chunks.append(chunk)
+                chunk = []
+                chunk_length = 0
+        if chunk:
+            chunks.append(chunk)
+
+        # Execute them
+        results = []
+        for chunk in chunks:
+            results.extend(self.__execute_chunk(chunk, results))
+        return results
+
+    def __execute_chunk(self, chunk: list, results: list) -> list:
+
+        # A single command does not need any special handling
+        if len(chunk) == 1:
+            command, data, command_def = chunk[0]
+            try:
+                output = self.__write_and_read(command, command_def['string'], command_def['end'],
+                                               command_def['timeout'])
+            except GenericATError:
+                raise ATBatchError(command, len(results), results)
+            return [ModemBatchResult(command, output)]
+
+        command_string = 'AT' + ';'.join([command_def['string'][2:] for _, _, command_def in chunk])
+        timeout = sum([command_def['timeout'] for _, _, command_def in chunk])
+        commands_label = ';'.join([command for command, _, _ in chunk])
+
+        try:
+            # Keep the raw line breaks, cleaning the output would join the reply lines together
+            output = self.__write_and_read(commands_label, command_string, 'OK', timeout, clean_output=False)
+        except GenericATError:
+            # The modem stops at the first failing command of the line but does not tell which one
+            # it was, so replay the line one command at a time to find it out. The last command is
+            # never replayed: if all the others succeed, it is the one that failed. This way the
+            # non idempotent commands, only allowed last in a line, are never sent twice.
+            self.logger.debug('Batched line failed, replaying "{}" one by one'.format(commands_label))
+            chunk_results = []
+            for item in chunk[:-1]:
+                chunk_results.extend(self.__execute_chunk([item], results + chunk_results))
+            raise ATBatchError(chunk[-1][0], len(results) + len(chunk_results), results + chunk_results)
+
+        # Split the output back to the commands: only queries answer with an informational line,
+        # starting with the command name (as in "+SAPBR: 1,1,..." for "AT+SAPBR=2,1"), and the
+        # modem answers them in order. Setters only answer with the final "OK".
+        outputs = [''] * len(chunk)
+        next_index = 0
+        for line in output.replace('\r', '').split('\n'):
+            if not line or line == command_string:
+                continue
+            for index in range(next_index, len(chunk)):
+                command_def = chunk[index][2]
+                if command_def['batch'] != 'query':
+                    continue
+                if line.startswith(self.__get_command_prefix(command_def['string']) + ':'):
+                    outputs[index] = line
+                    next_index = index + 1
+                    break
+
+        return [ModemBatchResult(command, outputs[index]) for index, (command, _, _) in enumerate(chunk)]
+
+    @staticmethod
+    def __get_command_prefix(command_string: str) -> str:
+        prefix = command_string[2:]
+        for separator in ('=', '?'):
+            prefix = prefix.split(separator)[0]
+        return prefix
+
     # ----------------------
     #  Function commands
     # ----------------------
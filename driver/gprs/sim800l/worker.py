@@ -0,0 +1,284 @@
+from .modem import Sim800lModem
+import _thread
+import time
+
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:
+    # CPython
+    def ticks_ms() -> int:
+        return int(time.monotonic() * 1000)
+
+    def ticks_diff(end: int, start: int) -> int:
+        return end - start
+
+
+class ModemRingBuffer:
+    """
+    Bounded single producer / single consumer queue.
+
+    The producer only moves the tail and the consumer only moves the head, so no lock is
+    needed as long as each side is used by a single thread.
+    """
+    __items: list
+    __size: int
+    __head: int
+    __tail: int
+
+    def __init__(self, size: int):
+        # One slot is always left empty to tell a full buffer from an empty one
+        self.__size = size + 1
+        self.__items = [None] * self.__size
+        self.__head = 0
+        self.__tail = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return self.__head == self.__tail
+
+    @is_empty.setter
+    def is_empty(self, value: bool) -> None:
+        raise Exception('unable to set is_empty')
+
+    @property
+    def is_full(self) -> bool:
+        return (self.__tail + 1) % self.__size == self.__head
+
+    @is_full.setter
+    def is_full(self, value: bool) -> None:
+        raise Exception('unable to set is_full')
+
+    def put(self, item) -> bool:
+        if self.is_full:
+            return False
+        self.__items[self.__tail] = item
+        # Publish the item only once it has been stored
+        self.__tail = (self.__tail + 1) % self.__size
+        return True
+
+    def get(self):
+        if self.is_empty:
+            return None
+        item = self.__items[self.__head]
+        self.__items[self.__head] = None
+        self.__head = (self.__head + 1) % self.__size
+        return item
+
+
+class ModemFuture:
+    __worker: 'Sim800lModemWorker'
+    __is_done: bool
+    __result: object
+    __exception: BaseException | None
+
+    def __init__(self, worker: 'Sim800lModemWorker'):
+        self.__worker = worker
+        self.__is_done = False
+        self.__result = None
+        self.__exception = None
+
+    def set_result(self, result) -> None:
+        self.__result = result
+        self.__is_done = True
+
+    def set_exception(self, exception: BaseException) -> None:
+        self.__exception = exception
+        self.__is_done = True
+
+    def done(self) -> bool:
+        if not self.__is_done:
+            self.__worker.poll()
+        return self.__is_done
+
+    def result(self, timeout: float | None = None):
+        started_at = ticks_ms()
+        while not self.done():
+            if timeout is not None and ticks_diff(ticks_ms(), started_at) >= timeout * 1000:
+                raise Exception('Timeout waiting for modem worker result (timeout={})'.format(timeout))
+            time.sleep(self.__worker.idle_sleep_seconds)
+
+        if self.__exception is not None:
+            raise self.__exception
+        return self.__result
+
+    def exception(self) -> BaseException | None:
+        if not self.done():
+            return None
+        return self.__exception
+
+
+class Sim800lModemWorker:
+    """
+    Runs the modem I/O on a separate thread (core 1 on the RP2040).
+
+    Requests are submitted from a single application thread and get a ModemFuture back, which
+    can be polled with done() or waited on with result(). Exceptions raised by the modem are
+    re-raised by result(). Once started, the modem must only be used through the worker.
+
+    All the attributes shared with the worker thread are set in __init__: on the RP2040 there
+    is no GIL, and adding keys to the instance dict while the other core reads it is a race.
+    """
+    idle_sleep_seconds: float = 0.01
+
+    __modem: Sim800lModem
+    __queue_size: int
+    __requests: ModemRingBuffer
+    __responses: ModemRingBuffer
+
+    # state, only changed by the application thread
+    __state_pending: int
+    __state_is_started: bool
+    __state_is_stopping: bool
+    # state, set by the application thread on start and cleared by the worker thread on exit
+    __state_is_running: bool
+
+    def __init__(self, modem: Sim800lModem, queue_size: int = 8) -> None:
+        self.__modem = modem
+        self.__queue_size = queue_size
+        self.__requests = ModemRingBuffer(queue_size)
+        self.__responses = ModemRingBuffer(queue_size)
+        self.__state_pending = 0
+        self.__state_is_started = False
+        self.__state_is_stopping = False
+        self.__state_is_running = False
+
+    @property
+    def modem(self) -> Sim800lModem:
+        return self.__modem
+
+    @modem.setter
+    def modem(self, value: Sim800lModem) -> None:
+        raise Exception('unable to set modem')
+
+    @property
+    def is_running(self) -> bool:
+        return self.__state_is_running
+
+    @is_running.setter
+    def is_running(self, value: bool) -> None:
+        raise Exception('unable to set is_running')
+
+    @property
+    def pending(self) -> int:
+        return self.__state_pending
+
+    @pending.setter
+    def pending(self, value: int) -> None:
+        raise Exception('unable to set pending')
+
+    def start(self) -> None:
+        """Start the worker thread, a stopped worker can be started again once is_running is False."""
+        if self.__state_is_running:
+            raise Exception('Modem worker is already running')
+        self.__state_is_started = True
+        self.__state_is_stopping = False
+        self.__state_is_running = True
+        try:
+            _thread.start_new_thread(self.__run, ())
+        except:
+            # e.g. OSError on the RP2040 when core 1 is already in use
+            self.__state_is_started = False
+            self.__state_is_running = False
+            raise
+
+    def stop(self) -> ModemFuture:
+        """Ask the worker to exit once the requests submitted so far are processed."""
+        future = self.__submit(None, None, (), {})
+        # From now on no thread would process new requests
+        self.__state_is_stopping = True
+        return future
+
+    # ----------------------
+    # Submit requests
+    # ----------------------
+    def submit(self, method: str, *args, **kwargs) -> ModemFuture:
+        """Call a Sim800lModem method (e.g. "initialize", "connect") on the worker."""
+        return self.__submit('modem', method, args, kwargs)
+
+    def execute_at_command(self, command: str, data=None, clean_output=True) -> ModemFuture:
+        return self.__submit('uart', 'execute_at_command', (command, data, clean_output), {})
+
+    def execute_batch(self, commands: list) -> ModemFuture:
+        return self.__submit('uart', 'execute_batch', (commands,), {})
+
+    def read(self, name: str) -> ModemFuture:
+        """Read a ModemUART status property (e.g. "signal", "battery", "ip_addr") on the worker."""
+        return self.__submit('read', name, (), {})
+
+    def http_request(self, url, mode='GET', data=None, content_type='application/json') -> ModemFuture:
+        return self.submit('http_request', url, mode=mode, data=data, content_type=content_type)
+
+    def __submit(self, target: str | None, name: str | None, args: tuple, kwargs: dict) -> ModemFuture:
+        if not self.__state_is_started:
+            raise Exception('Modem worker is not started')
+        if self.__state_is_stopping:
+            raise Exception('Modem worker is stopped, cannot submit requests')
+
+        # Keep room in the response queue for every request in flight, so the worker never blocks
+        if self.__state_pending >= self.__queue_size:
+            self.poll()
+            if self.__state_pending >= self.__queue_size:
+                raise Exception('Modem worker queue is full ({} requests pending)'.format(self.__state_pending))
+
+        future = ModemFuture(self)
+        self.__requests.put((future, target, name, args, kwargs))
+        self.__state_pending += 1
+        return future
+
+    # ----------------------
+    # Collect responses
+    # ----------------------
+    def poll(self) -> int:
+        """Resolve the futures of the requests completed by the worker, returns how many."""
+        resolved = 0
+        while True:
+            response = self.__responses.get()
+            if response is None:
+                break
+            future, result, exception = response
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+            self.__state_pending -= 1
+            resolved += 1
+        return resolved
+
+    # ----------------------
+    # Worker thread
+    # ----------------------
+    def __run(self) -> None:
+        while True:
+            request = self.__requests.get()
+            if request is None:
+                time.sleep(self.idle_sleep_seconds)
+                continue
+
+            future, target, name, args, kwargs = request
+            if target is None:
+                # Clear the flag before answering, so that once stop() resolves start() can be called again
+                self.__state_is_running = False
+                self.__responses.put((future, None, None))
+                return
+
+            result = None
+            exception = None
+            try:
+                result = self.__execute(target, name, args, kwargs)
+            except Exception as e:
+                exception = e
+            self.__responses.put((future, result, exception))
+
+    def __execute(self, target: str, name: str, args: tuple, kwargs: dict):
+        if target == 'modem':
+            return getattr(self.__modem, name)(*args, **kwargs)
+
+        # The UART is created by Sim800lModem.initialize(), so resolve it at execution time
+        if not self.__modem.uart:
+            raise Exception('Modem is not initialized, cannot use its UART')
+        if target == 'uart':
+            return getattr(self.__modem.uart, name)(*args, **kwargs)
+        if target == 'read':
+            return getattr(self.__modem.uart, name)
+
+        raise Exception('Unknown worker target "{}"'.format(target))
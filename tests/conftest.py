@@ -0,0 +1,72 @@
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeLine(str):
+    # ModemUART calls encode() on what readline() returns and compares it with str
+    def encode(self, *args, **kwargs):
+        return str(self)
+
+
+class FakeUART:
+    """Simulated SIM800L: answers the AT lines written to it from a table of replies."""
+
+    def __init__(self, *args, **kwargs):
+        self.written = []
+        self.replies = {}
+        self.late_replies = {}
+        self.finals = {}
+        self.errors = set()
+        self.__lines = []
+
+    def write(self, data):
+        command_string = data.strip()
+        self.written.append(command_string)
+        self.__lines.append(command_string + '\r\r\n')
+
+        bodies = command_string[3:].split(';+') if command_string.startswith('AT+') else [command_string]
+        for body in bodies:
+            if body in self.errors:
+                self.__lines.append('ERROR\r\n')
+                return
+            reply = self.replies.get(body)
+            if reply is not None:
+                self.__lines.append('\r\n')
+                self.__lines.extend([line + '\r\n' for line in reply.split('\n')])
+        self.__lines.append('\r\n')
+        self.__lines.append(self.finals.get(bodies[-1], 'OK') + '\r\n')
+
+        # Unsolicited replies, sent after the final result (as "+HTTPACTION: ...")
+        late_reply = self.late_replies.get(bodies[-1])
+        if late_reply is not None:
+            self.__lines.append('\r\n')
+            self.__lines.append(late_reply + '\r\n')
+
+    def readline(self):
+        if not self.__lines:
+            return None
+        return FakeLine(self.__lines.pop(0))
+
+
+machine = types.ModuleType('machine')
+machine.UART = FakeUART
+sys.modules.setdefault('machine', machine)
+
+
+@pytest.fixture
+def uart():
+    from driver.gprs.sim800l import ModemUART, ModemLoggerInterface
+
+    uart = ModemUART(rx_pin=1, tx_pin=2)
+    uart.logger = ModemLoggerInterface()
+    uart.replies.update({
+        'CSQ': '+CSQ: 20,0',
+        'CBC': '+CBC: 0,80,4000',
+        'SAPBR=2,1': '+SAPBR: 1,1,"10.0.0.1"',
+    })
+    return uart
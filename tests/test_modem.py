@@ -0,0 +1,89 @@
+import pytest
+
+from driver.gprs.sim800l import Sim800lModem, ModemLoggerInterface, GenericATError
+
+
+@pytest.fixture
+def modem(uart):
+    uart.replies.update({
+        'CIPSSL=?': '+CIPSSL: (0-1)',
+        'HTTPREAD': '+HTTPREAD: 5\nhello',
+    })
+    uart.late_replies.update({
+        'HTTPACTION=0': '+HTTPACTION: 0,200,5',
+        'HTTPACTION=1': '+HTTPACTION: 1,201,5',
+    })
+    uart.finals['HTTPDATA=7,5000'] = 'DOWNLOAD'
+
+    modem = Sim800lModem(uart=uart)
+    modem.logger = ModemLoggerInterface()
+    modem.initialize()
+    uart.written.clear()
+    return modem
+
+
+@pytest.fixture
+def connected_modem(modem):
+    modem.connect('internet', 'user', 'pwd')
+    modem.uart.written.clear()
+    return modem
+
+
+def test_connect_batches_setup_in_one_line(modem):
+    modem.connect('internet', 'user', 'pwd')
+
+    assert modem.is_connected
+    assert modem.uart.written == [
+        'AT+SAPBR=0,1',
+        'AT+SAPBR=3,1,"Contype","GPRS";+SAPBR=3,1,"APN","internet";'
+        '+SAPBR=3,1,"USER","user";+SAPBR=3,1,"PWD","pwd";+SAPBR=1,1',
+        'AT+SAPBR=2,1',
+    ]
+
+
+def test_connect_raises_setapn_error(modem):
+    modem.uart.errors.add('SAPBR=3,1,"APN","internet"')
+
+    with pytest.raises(GenericATError):
+        modem.connect('internet', 'user', 'pwd')
+    assert not modem.is_connected
+
+
+@pytest.mark.parametrize('url, ssl', [
+    ('https://example.com', 'HTTPSSL=1'),
+    ('http://example.com', 'HTTPSSL=0'),
+])
+def test_http_get_batches_setup_in_one_line(connected_modem, url, ssl):
+    response = connected_modem.http_request(url)
+
+    assert response.status_code == 200
+    # getdata is read raw, without cleaning the line breaks
+    assert response.content.strip() == 'hello'
+    assert connected_modem.uart.written == [
+        'AT+HTTPTERM',
+        'AT+HTTPINIT',
+        'AT+HTTPPARA="CID",1;+{};+HTTPPARA="URL","{}"'.format(ssl, url),
+        'AT+HTTPACTION=0',
+        'AT+HTTPREAD',
+        'AT+HTTPTERM',
+    ]
+
+
+@pytest.mark.parametrize('url, ssl', [
+    ('https://example.com', 'HTTPSSL=1'),
+    ('http://example.com', 'HTTPSSL=0'),
+])
+def test_http_post_batches_setup_in_one_line(connected_modem, url, ssl):
+    response = connected_modem.http_request(url, mode='POST', data='{"a":1}')
+
+    assert response.status_code == 201
+    assert connected_modem.uart.written == [
+        'AT+HTTPTERM',
+        'AT+HTTPINIT',
+        'AT+HTTPPARA="CID",1;+{};+HTTPPARA="URL","{}";+HTTPPARA="CONTENT","application/json"'.format(ssl, url),
+        'AT+HTTPDATA=7,5000',
+        '{"a":1}',
+        'AT+HTTPACTION=1',
+        'AT+HTTPREAD',
+        'AT+HTTPTERM',
+    ]
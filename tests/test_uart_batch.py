@@ -0,0 +1,74 @@
+import pytest
+
+from driver.gprs.sim800l import ATBatchError, GenericATError
+
+
+def test_batch_joins_commands_in_one_line(uart):
+    results = uart.execute_batch(['initgprs', ('setapn', 'internet'), 'opengprs'])
+
+    assert uart.written == ['AT+SAPBR=3,1,"Contype","GPRS";+SAPBR=3,1,"APN","internet";+SAPBR=1,1']
+    assert [(result.command, result.output) for result in results] == [
+        ('initgprs', ''), ('setapn', ''), ('opengprs', '')]
+
+
+def test_batch_splits_query_replies(uart):
+    results = uart.execute_batch(['signal', 'battery', 'initgprs', 'getbear'])
+
+    assert uart.written == ['AT+CSQ;+CBC;+SAPBR=3,1,"Contype","GPRS";+SAPBR=2,1']
+    assert [(result.command, result.output) for result in results] == [
+        ('signal', '+CSQ: 20,0'),
+        ('battery', '+CBC: 0,80,4000'),
+        ('initgprs', ''),
+        ('getbear', '+SAPBR: 1,1,"10.0.0.1"'),
+    ]
+
+
+def test_batch_closes_line_after_non_idempotent_command(uart):
+    uart.execute_batch(['opengprs', 'sethttp', 'closehttp', 'signal'])
+
+    assert uart.written == ['AT+SAPBR=1,1', 'AT+HTTPPARA="CID",1', 'AT+HTTPTERM', 'AT+CSQ']
+
+
+def test_batch_splits_lines_to_max_length(uart):
+    uart.MAX_BATCH_LINE_LENGTH = 40
+
+    results = uart.execute_batch(['initgprs', ('setapn', 'internet'), ('setuser', 'user')])
+
+    assert uart.written == [
+        'AT+SAPBR=3,1,"Contype","GPRS"',
+        'AT+SAPBR=3,1,"APN","internet"',
+        'AT+SAPBR=3,1,"USER","user"',
+    ]
+    assert all(len(line) <= 40 for line in uart.written)
+    assert len(results) == 3
+
+
+def test_batch_attributes_error_to_failing_command(uart):
+    uart.errors.add('SAPBR=3,1,"APN","internet"')
+
+    with pytest.raises(ATBatchError) as error:
+        uart.execute_batch(['initgprs', ('setapn', 'internet'), 'opengprs'])
+
+    assert isinstance(error.value, GenericATError)
+    assert error.value.command == 'setapn'
+    assert error.value.index == 1
+    assert [result.command for result in error.value.results] == ['initgprs']
+    # The failed line is replayed one command at a time, stopping at the failing one
+    assert uart.written[1:] == ['AT+SAPBR=3,1,"Contype","GPRS"', 'AT+SAPBR=3,1,"APN","internet"']
+
+
+def test_batch_does_not_replay_failing_last_command(uart):
+    uart.errors.add('SAPBR=1,1')
+
+    with pytest.raises(ATBatchError) as error:
+        uart.execute_batch(['initgprs', ('setapn', 'internet'), 'opengprs'])
+
+    assert error.value.command == 'opengprs'
+    assert error.value.index == 2
+    assert [result.command for result in error.value.results] == ['initgprs', 'setapn']
+    # Only the commands before the last one are replayed, "AT+SAPBR=1,1" is sent once
+    assert uart.written == [
+        'AT+SAPBR=3,1,"Contype","GPRS";+SAPBR=3,1,"APN","internet";+SAPBR=1,1',
+        'AT+SAPBR=3,1,"Contype","GPRS"',
+        'AT+SAPBR=3,1,"APN","internet"',
+    ]
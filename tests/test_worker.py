@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+
+from driver.gprs.sim800l import Sim800lModem, ModemLoggerInterface
+from driver.gprs.sim800l import worker as worker_module
+from driver.gprs.sim800l.worker import Sim800lModemWorker, ModemRingBuffer
+
+
+@pytest.fixture
+def worker(uart):
+    modem = Sim800lModem(uart=uart)
+    modem.logger = ModemLoggerInterface()
+    worker = Sim800lModemWorker(modem, queue_size=2)
+    worker.start()
+    yield worker
+    if worker.is_running:
+        worker.poll()
+        worker.stop().result(timeout=5)
+
+
+def test_ring_buffer_is_bounded():
+    buffer = ModemRingBuffer(2)
+
+    assert buffer.is_empty
+    assert buffer.put(1)
+    assert buffer.put(2)
+    assert buffer.is_full
+    assert not buffer.put(3)
+    assert buffer.get() == 1
+    assert buffer.put(3)
+    assert buffer.get() == 2
+    assert buffer.get() == 3
+    assert buffer.get() is None
+
+
+def test_worker_delivers_results(worker):
+    ip_addr = worker.read('ip_addr')
+    batch = worker.execute_batch(['signal', 'battery'])
+
+    assert ip_addr.result(timeout=5) == '10.0.0.1'
+    assert [result.output for result in batch.result(timeout=5)] == ['+CSQ: 20,0', '+CBC: 0,80,4000']
+    assert worker.pending == 0
+
+
+def test_worker_passes_exceptions_back(worker):
+    future = worker.execute_at_command('nope')
+
+    with pytest.raises(Exception, match='Unknown command "nope"'):
+        future.result(timeout=5)
+    assert isinstance(future.exception(), Exception)
+
+    # The worker keeps serving requests after an exception
+    assert worker.read('signal').result(timeout=5) == pytest.approx(20 / 30)
+
+
+def test_worker_refuses_requests_when_queue_is_full(worker):
+    # Keep the worker busy on the first request so both slots stay in flight
+    release = threading.Event()
+    worker.modem.wait_for_release = release.wait
+    blocked = worker.submit('wait_for_release', 5)
+    queued = worker.read('signal')
+
+    with pytest.raises(Exception, match='queue is full'):
+        worker.read('battery')
+
+    release.set()
+    assert blocked.result(timeout=5) is True
+    assert queued.result(timeout=5) == pytest.approx(20 / 30)
+    assert worker.read('battery').result(timeout=5) == '+CBC: 0,80,4000'
+
+
+def test_worker_rejects_requests_after_stop(worker):
+    worker.stop().result(timeout=5)
+    assert not worker.is_running
+
+    with pytest.raises(Exception, match='stopped'):
+        worker.read('signal')
+    with pytest.raises(Exception, match='stopped'):
+        worker.stop()
+
+
+def test_worker_can_be_started_again_after_stop(worker):
+    worker.stop().result(timeout=5)
+    assert not worker.is_running
+
+    worker.start()
+
+    assert worker.read('ip_addr').result(timeout=5) == '10.0.0.1'
+
+
+def test_worker_cannot_be_started_twice(worker):
+    with pytest.raises(Exception, match='already running'):
+        worker.start()
+
+
+def test_worker_result_timeout_is_measured(worker):
+    release = threading.Event()
+    worker.modem.wait_for_release = release.wait
+    blocked = worker.submit('wait_for_release', 5)
+
+    started_at = time.monotonic()
+    with pytest.raises(Exception, match='Timeout waiting'):
+        blocked.result(timeout=0.2)
+    assert time.monotonic() - started_at < 1
+
+    release.set()
+    assert blocked.result(timeout=5) is True
+
+
+def test_worker_start_failure_resets_state(uart, monkeypatch):
+    def start_new_thread(function, args):
+        raise OSError('core1 in use')
+
+    modem = Sim800lModem(uart=uart)
+    modem.logger = ModemLoggerInterface()
+    worker = Sim800lModemWorker(modem)
+    monkeypatch.setattr(worker_module._thread, 'start_new_thread', start_new_thread)
+
+    with pytest.raises(OSError):
+        worker.start()
+    assert not worker.is_running
+    with pytest.raises(Exception, match='not started'):
+        worker.read('signal')
+
+    monkeypatch.undo()
+    worker.start()
+    assert worker.read('ip_addr').result(timeout=5) == '10.0.0.1'
+    worker.stop().result(timeout=5)